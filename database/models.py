@@ -1,74 +1,440 @@
+import asyncio
+import atexit
+import queue
 import sqlite3
-from datetime import datetime, date
-from typing import List, Dict, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import date
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
+
+# Maximale Anzahl ungenutzter Verbindungen, die im Pool vorgehalten werden
+POOL_SIZE = 8
+
+# INSERT ... RETURNING gibt es erst ab SQLite 3.35, ältere Versionen nutzen lastrowid
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+RETURNING_ID = ' RETURNING id' if HAS_RETURNING else ''
+
+# Aktuelle Schema-Version (PRAGMA user_version), siehe init_database
+SCHEMA_VERSION = 3
+
+# Tabellen-Schema, wird in einem einzigen executescript angelegt
+SCHEMA_DDL = '''
+    -- Exams (new top-level table)
+    CREATE TABLE IF NOT EXISTS exams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- Worksheets (now references exams)
+    CREATE TABLE IF NOT EXISTS worksheets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        semester INTEGER NOT NULL,
+        sheet_number INTEGER NOT NULL,
+        exam_id INTEGER,
+        FOREIGN KEY (exam_id) REFERENCES exams(id),
+        UNIQUE(exam_id, semester, sheet_number)
+    );
+    
+    -- Tasks
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        worksheet_id INTEGER NOT NULL,
+        task_number TEXT NOT NULL,
+        total_points INTEGER DEFAULT 0,
+        times_done INTEGER DEFAULT 0,
+        FOREIGN KEY (worksheet_id) REFERENCES worksheets(id),
+        UNIQUE(worksheet_id, task_number)
+    );
+    
+    -- Solution attempts
+    CREATE TABLE IF NOT EXISTS solution_attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL,
+        attempt_date DATE NOT NULL,
+        total_time_seconds INTEGER,
+        status TEXT DEFAULT 'completed',
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (task_id) REFERENCES tasks(id)
+    );
+    
+    -- Tasks mit den Angaben ihres Übungsblatts (gemeinsame Basis der Lesezugriffe)
+    CREATE VIEW IF NOT EXISTS task_with_sheet AS
+    SELECT
+        t.id,
+        t.worksheet_id,
+        t.task_number,
+        t.total_points,
+        t.times_done,
+        w.semester,
+        w.sheet_number,
+        w.exam_id
+    FROM tasks t
+    JOIN worksheets w ON w.id = t.worksheet_id;
+    
+    -- Anzahl Aufgaben je (Prüfung, Punkte, times_done) für get_task_counts_by_point_range,
+    -- gepflegt durch die Trigger auf tasks (exam_id 0 = Blatt ohne Prüfung)
+    CREATE TABLE IF NOT EXISTS task_level_counts (
+        exam_id INTEGER NOT NULL,
+        total_points INTEGER NOT NULL,
+        times_done INTEGER NOT NULL,
+        task_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (exam_id, total_points, times_done)
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counts_insert
+    AFTER INSERT ON tasks
+    WHEN NEW.total_points IS NOT NULL AND NEW.times_done IS NOT NULL
+    BEGIN
+        INSERT OR IGNORE INTO task_level_counts (exam_id, total_points, times_done)
+        SELECT COALESCE(exam_id, 0), NEW.total_points, NEW.times_done
+        FROM worksheets WHERE id = NEW.worksheet_id;
+        UPDATE task_level_counts SET task_count = task_count + 1
+        WHERE exam_id = (SELECT COALESCE(exam_id, 0) FROM worksheets WHERE id = NEW.worksheet_id)
+            AND total_points = NEW.total_points AND times_done = NEW.times_done;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counts_delete
+    AFTER DELETE ON tasks
+    WHEN OLD.total_points IS NOT NULL AND OLD.times_done IS NOT NULL
+    BEGIN
+        UPDATE task_level_counts SET task_count = task_count - 1
+        WHERE exam_id = (SELECT COALESCE(exam_id, 0) FROM worksheets WHERE id = OLD.worksheet_id)
+            AND total_points = OLD.total_points AND times_done = OLD.times_done;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counts_update
+    AFTER UPDATE OF worksheet_id, total_points, times_done ON tasks
+    BEGIN
+        UPDATE task_level_counts SET task_count = task_count - 1
+        WHERE exam_id = (SELECT COALESCE(exam_id, 0) FROM worksheets WHERE id = OLD.worksheet_id)
+            AND total_points = OLD.total_points AND times_done = OLD.times_done;
+        INSERT OR IGNORE INTO task_level_counts (exam_id, total_points, times_done)
+        SELECT COALESCE(exam_id, 0), NEW.total_points, NEW.times_done
+        FROM worksheets
+        WHERE id = NEW.worksheet_id AND NEW.total_points IS NOT NULL AND NEW.times_done IS NOT NULL;
+        UPDATE task_level_counts SET task_count = task_count + 1
+        WHERE exam_id = (SELECT COALESCE(exam_id, 0) FROM worksheets WHERE id = NEW.worksheet_id)
+            AND total_points = NEW.total_points AND times_done = NEW.times_done;
+    END;
+'''
+
+# Häufig genutzte SQL-Anweisungen als Konstanten: identischer Text trifft
+# bei jedem Aufruf den Statement-Cache der (persistenten) Verbindung
+EXAM_FILTER = ' AND t.exam_id = ?'
+
+# Zufällige Aufgabe auf dem niedrigsten times_done Level (Round-basierte Logik):
+# nach Level sortieren, innerhalb des Levels zufällig, erste Zeile nehmen
+_SQL_RANDOM_TASK_TEMPLATE = '''
+    SELECT 
+        t.id,
+        t.semester,
+        t.sheet_number,
+        t.task_number,
+        t.total_points,
+        t.times_done
+    FROM task_with_sheet t
+    WHERE t.total_points >= ? AND t.total_points <= ?{exam_filter}
+    ORDER BY t.times_done, RANDOM()
+    LIMIT 1
+'''
+SQL_RANDOM_TASK = _SQL_RANDOM_TASK_TEMPLATE.format(exam_filter='')
+SQL_RANDOM_TASK_EXAM = _SQL_RANDOM_TASK_TEMPLATE.format(exam_filter=EXAM_FILTER)
+
+SQL_MARK_DONE = '''
+    UPDATE tasks 
+    SET times_done = times_done + 1
+    WHERE id = ?
+'''
+
+# Histogramm times_done -> Anzahl aus der per Trigger gepflegten Summentabelle
+# (wenige Zeilen je Punktwert statt eines Scans über alle Aufgaben)
+SQL_LEVEL_HISTOGRAM = '''
+    SELECT times_done, SUM(task_count)
+    FROM task_level_counts
+    WHERE total_points >= ? AND total_points <= ? AND task_count > 0
+    GROUP BY times_done
+'''
+SQL_LEVEL_HISTOGRAM_EXAM = '''
+    SELECT times_done, SUM(task_count)
+    FROM task_level_counts
+    WHERE total_points >= ? AND total_points <= ? AND task_count > 0 AND exam_id = ?
+    GROUP BY times_done
+'''
+
+SQL_CREATE_ATTEMPT = '''
+    INSERT INTO solution_attempts (task_id, attempt_date, status)
+    VALUES (?, ?, ?)
+''' + RETURNING_ID
+
+SQL_AUTO_SAVE = '''
+    UPDATE solution_attempts 
+    SET total_time_seconds = ?, last_updated = CURRENT_TIMESTAMP
+    WHERE id = ? AND status = 'in_progress'
+'''
+
+SQL_INCOMPLETE_ATTEMPTS = '''
+    SELECT 
+        sa.id AS attempt_id,
+        sa.task_id,
+        COALESCE(sa.total_time_seconds, 0) AS elapsed_time,
+        sa.attempt_date,
+        sa.last_updated,
+        t.semester,
+        t.sheet_number,
+        t.task_number,
+        t.total_points
+    FROM solution_attempts sa
+    JOIN task_with_sheet t ON sa.task_id = t.id
+    WHERE sa.status = 'in_progress'
+    ORDER BY sa.last_updated DESC
+'''
+
+SQL_TASK_BY_ATTEMPT = '''
+    SELECT 
+        t.id,
+        t.semester,
+        t.sheet_number,
+        t.task_number,
+        t.total_points,
+        t.times_done
+    FROM solution_attempts sa
+    JOIN task_with_sheet t ON sa.task_id = t.id
+    WHERE sa.id = ?
+'''
+
+# Prüfung nach ID oder Name: gleiche Spalten, nur die WHERE-Spalte unterscheidet sich
+_SQL_EXAM_TEMPLATE = '''
+    SELECT id, name, description, created_at
+    FROM exams
+    WHERE {column} = ?
+'''
+SQL_EXAM_BY_ID = _SQL_EXAM_TEMPLATE.format(column='id')
+SQL_EXAM_BY_NAME = _SQL_EXAM_TEMPLATE.format(column='name')
+
+@lru_cache(maxsize=1024)
+def _task_label(semester: int, sheet_number: int, task_number: str) -> str:
+    """Kurzbezeichnung einer Aufgabe, z.B. 'Sem1 Bl2 Aufg3.1'"""
+    return f"Sem{semester} Bl{sheet_number} Aufg{task_number}"
+
+def _inserted_id(cursor: sqlite3.Cursor) -> Optional[int]:
+    """Liest die ID der eingefügten Zeile (aus RETURNING bzw. lastrowid)"""
+    if HAS_RETURNING:
+        row = cursor.fetchone()
+        return row[0] if row else None
+    return cursor.lastrowid
+
+def _close_connection(conn: sqlite3.Connection, checkpoint: bool = False):
+    """Aktualisiert die Planer-Statistiken (PRAGMA optimize) und schließt die Verbindung"""
+    try:
+        conn.execute('PRAGMA optimize')
+        if checkpoint:
+            # WAL-Datei zurück in die Hauptdatenbank schreiben und auf 0 Bytes kürzen
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    except sqlite3.Error:
+        # Verbindung bereits geschlossen oder Datenbank gesperrt
+        pass
+    conn.close()
 
 class DatabaseManager:
     def __init__(self, db_path="physics_tasks.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=POOL_SIZE)
+        # Hintergrund-Thread für arun, wird erst bei Bedarf gestartet
+        self._executor: Optional[ThreadPoolExecutor] = None
     
-    def get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _open_connection(self) -> sqlite3.Connection:
+        """Öffnet eine neue Verbindung und setzt die Performance-Pragmas"""
+        # Autocommit-Modus: Transaktionen werden explizit mit BEGIN gestartet
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA busy_timeout=5000')
+        # Zeilen als Mapping: dict(row) statt manuellem Index-Zugriff
+        conn.row_factory = sqlite3.Row
+        atexit.register(_close_connection, conn)
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Holt eine Verbindung aus dem Pool oder öffnet bei Bedarf eine neue"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._open_connection()
+    
+    def _release(self, conn: sqlite3.Connection):
+        """Gibt eine Verbindung an den Pool zurück (schließt sie, wenn der Pool voll ist)"""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            _close_connection(conn)
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Gibt die Verbindung des aktuellen Threads zurück (bleibt für die Lebensdauer des Threads reserviert)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._acquire()
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Schließt die Verbindung des aktuellen Threads und alle Verbindungen im Pool"""
+        # Laufende arun-Aufrufe abwarten, damit ihre Verbindungen im Pool liegen
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        conns = []
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conns.append(conn)
+        
+        while True:
+            try:
+                conns.append(self._pool.get_nowait())
+            except queue.Empty:
+                break
+        
+        # Die zuletzt geschlossene Verbindung führt den WAL-Checkpoint aus
+        for i, conn in enumerate(conns):
+            _close_connection(conn, checkpoint=(i == len(conns) - 1))
+    
+    async def arun(self, fn: Callable[..., Any], *args) -> Any:
+        """Führt fn(*args) im Hintergrund-Thread aus
+        
+        Für asyncio-Oberflächen: Repository-Methoden blockieren so nicht die Event-Loop.
+        """
+        if self._executor is None:
+            # Ein Worker: Aufrufe laufen nacheinander, Schreibzugriffe bleiben serialisiert
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Leiht eine Verbindung aus dem Pool; ist im Thread bereits eine aktiv, wird diese wiederverwendet"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Fasst alle Schreibzugriffe im Block in einer Transaktion zusammen (verschachtelte Aufrufe laufen mit)"""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            # IMMEDIATE: Schreibsperre sofort holen statt beim ersten UPDATE
+            # (kein SQLITE_BUSY-Upgrade mitten in der Transaktion)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                # Auch bei KeyboardInterrupt/GeneratorExit: eine offen gebliebene
+                # Transaktion würde auf der gepinnten Verbindung alle späteren Writes schlucken
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
     
     def init_database(self):
         """Initialisiert die Datenbank mit allen Tabellen"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        # Exams (new top-level table)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Worksheets (now references exams)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS worksheets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                semester INTEGER NOT NULL,
-                sheet_number INTEGER NOT NULL,
-                exam_id INTEGER,
-                FOREIGN KEY (exam_id) REFERENCES exams(id),
-                UNIQUE(exam_id, semester, sheet_number)
-            )
-        ''')
-        
-        # Tasks
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                worksheet_id INTEGER NOT NULL,
-                task_number TEXT NOT NULL,
-                total_points INTEGER DEFAULT 0,
-                times_done INTEGER DEFAULT 0,
-                FOREIGN KEY (worksheet_id) REFERENCES worksheets(id),
-                UNIQUE(worksheet_id, task_number)
-            )
-        ''')
-        
-        
-        # Solution attempts
+        try:
+            # Tables in one script; the leading BEGIN keeps the transaction open
+            # for the migration and index statements below
+            cursor.executescript('BEGIN IMMEDIATE;' + SCHEMA_DDL)
+            
+            # Einmalige Schritte werden über PRAGMA user_version verfolgt
+            cursor.execute('PRAGMA user_version')
+            version = cursor.fetchone()[0]
+            
+            # Version 1: Migrate existing data (status / last_updated columns)
+            if version < 1:
+                self._migrate_existing_data(cursor)
+            
+            # Covering index for point range / times_done filters plus exam lookup
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tasks_points_done
+                ON tasks(total_points, times_done, worksheet_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_worksheets_exam
+                ON worksheets(exam_id)
+            ''')
+            
+            # Partial index matching the timed-attempts filter of get_statistics
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sa_task_time
+                ON solution_attempts(task_id, total_time_seconds)
+                WHERE total_time_seconds IS NOT NULL
+            ''')
+            
+            # Attempt lookups by task (joins, get_task_with_longest_time_per_point)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_attempts_task
+                ON solution_attempts(task_id)
+            ''')
+            
+            # Tiny partial index: exactly the rows and order of get_incomplete_attempts
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_attempts_status_updated
+                ON solution_attempts(status, last_updated DESC)
+                WHERE status = 'in_progress'
+            ''')
+            
+            # Version 2: Planner statistics once, so the new indexes are actually chosen
+            # (afterwards kept current by PRAGMA optimize on close)
+            if version < 2:
+                cursor.execute('ANALYZE')
+            
+            # Version 3: Summentabelle für die Trigger einmalig aus tasks befüllen
+            if version < 3:
+                self._rebuild_task_level_counts(cursor)
+            
+            if version < SCHEMA_VERSION:
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            
+            conn.commit()
+        except BaseException:
+            # Sonst bliebe die gepinnte Verbindung in der Transaktion und
+            # transaction() würde alle späteren Writes als verschachtelt schlucken
+            conn.rollback()
+            raise
+    
+    def _rebuild_task_level_counts(self, cursor):
+        """Baut task_level_counts komplett aus tasks neu auf"""
+        cursor.execute('DELETE FROM task_level_counts')
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS solution_attempts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                attempt_date DATE NOT NULL,
-                total_time_seconds INTEGER,
-                status TEXT DEFAULT 'completed',
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (task_id) REFERENCES tasks(id)
-            )
+            INSERT INTO task_level_counts (exam_id, total_points, times_done, task_count)
+            SELECT COALESCE(w.exam_id, 0), t.total_points, t.times_done, COUNT(*)
+            FROM tasks t
+            JOIN worksheets w ON w.id = t.worksheet_id
+            WHERE t.total_points IS NOT NULL AND t.times_done IS NOT NULL
+            GROUP BY COALESCE(w.exam_id, 0), t.total_points, t.times_done
         ''')
-        
-        # Migrate existing data if needed
-        self._migrate_existing_data(cursor)
-        
-        conn.commit()
-        conn.close()
     
     def _migrate_existing_data(self, cursor):
         """Migriert bestehende Daten für Rückwärtskompatibilität"""
@@ -112,107 +478,68 @@ class TaskRepository:
         """Sets the current exam ID for filtering"""
         self.exam_id = exam_id
     
+    def batch(self):
+        """Führt alle Schreibzugriffe im with-Block in einer gemeinsamen Transaktion aus"""
+        return self.db_manager.transaction()
+    
     def get_random_task(self, min_points: int, max_points: int) -> Optional[Dict]:
         """Wählt zufällige Aufgabe im Punktebereich mit Round-basierter Logik"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        # Step 1: Find minimum completion level in the point range
-        min_completion_level = self._get_min_completion_level(cursor, min_points, max_points)
-        
-        if min_completion_level is None:
-            conn.close()
-            return None
-        
-        # Step 2: Get all tasks at the minimum completion level
-        tasks_at_min_level = self._get_tasks_at_completion_level(
-            cursor, min_points, max_points, min_completion_level
-        )
-        
-        if not tasks_at_min_level:
-            conn.close()
+        task = self.get_random_task_row(min_points, max_points)
+        if task is None:
             return None
-        
-        # Step 3: Randomly select from tasks at minimum completion level
-        from random import choice
-        task = choice(tasks_at_min_level)
-        
-        conn.close()
-        return {
-            'id': task[2],
-            'semester': task[0],
-            'sheet_number': task[1],
-            'task_number': task[3],
-            'total_points': task[4],
-            'times_done': task[5],
-            'is_repeat': task[5] > 0
-        }
+        return dict(task, is_repeat=task['times_done'] > 0)
     
-    def _get_min_completion_level(self, cursor, min_points: int, max_points: int) -> Optional[int]:
-        """Findet das minimale times_done Level im Punktebereich"""
-        query = '''
-            SELECT MIN(t.times_done)
-            FROM worksheets w
-            JOIN tasks t ON w.id = t.worksheet_id
-            WHERE t.total_points >= ? AND t.total_points <= ?
-        '''
-        
-        params = [min_points, max_points]
-        if self.exam_id:
-            query += ' AND w.exam_id = ?'
-            params.append(self.exam_id)
-        
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        return result[0] if result and result[0] is not None else None
-    
-    def _get_tasks_at_completion_level(self, cursor, min_points: int, max_points: int, completion_level: int) -> List:
-        """Holt alle Aufgaben mit einem bestimmten times_done Level"""
-        query = '''
-            SELECT 
-                w.semester,
-                w.sheet_number,
-                t.id,
-                t.task_number,
-                t.total_points,
-                t.times_done
-            FROM worksheets w
-            JOIN tasks t ON w.id = t.worksheet_id
-            WHERE t.total_points >= ? AND t.total_points <= ? AND t.times_done = ?
-        '''
+    def get_random_task_row(self, min_points: int, max_points: int) -> Optional[sqlite3.Row]:
+        """Wie get_random_task, liefert aber die rohe Zeile ohne Dict-Kopie"""
+        with self.db_manager.connection() as conn:
+            return self._select_random_task(conn, min_points, max_points)
+    
+    def start_random_attempt(self, min_points: int, max_points: int) -> Optional[Tuple[Dict, int]]:
+        """Wählt zufällige Aufgabe und legt in derselben Transaktion einen Lösungsversuch an"""
+        with self.db_manager.transaction() as conn:
+            task = self._select_random_task(conn, min_points, max_points)
+            if task is None:
+                return None
+            
+            # Direkt auf der Verbindung der Transaktion einfügen
+            cursor = conn.execute(SQL_CREATE_ATTEMPT, (task['id'], date.today(), 'in_progress'))
+            attempt_id = _inserted_id(cursor)
+            if attempt_id is None:
+                raise RuntimeError("Failed to create solution attempt - no ID returned")
         
-        params = [min_points, max_points, completion_level]
+        return dict(task, is_repeat=task['times_done'] > 0), attempt_id
+    
+    def _select_random_task(self, conn: sqlite3.Connection, min_points: int, max_points: int) -> Optional[sqlite3.Row]:
+        """Holt eine zufällige Aufgabe auf dem minimalen times_done Level"""
+        # One pass over the range: lowest level first, random order within it
         if self.exam_id:
-            query += ' AND w.exam_id = ?'
-            params.append(self.exam_id)
-        
-        cursor.execute(query, params)
-        return cursor.fetchall()
+            cursor = conn.execute(SQL_RANDOM_TASK_EXAM, (min_points, max_points, self.exam_id))
+        else:
+            cursor = conn.execute(SQL_RANDOM_TASK, (min_points, max_points))
+        return cursor.fetchone()
     
     def mark_task_done(self, task_id: int):
         """Markiert Aufgabe als erledigt"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE tasks 
-            SET times_done = times_done + 1
-            WHERE id = ?
-        ''', (task_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.db_manager.connection() as conn:
+            conn.execute(SQL_MARK_DONE, (task_id,))
+    
+    def mark_tasks_done(self, task_ids: List[int]):
+        """Markiert mehrere Aufgaben in einer Transaktion als erledigt"""
+        with self.db_manager.transaction() as conn:
+            conn.executemany(SQL_MARK_DONE, [(task_id,) for task_id in task_ids])
     
     def get_task_counts_by_point_range(self, min_points: int, max_points: int) -> Dict[str, int]:
         """Gibt Anzahl der Aufgaben im Punktebereich zurück mit Round-Informationen"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
+        # Ein einziger Scan: Anzahl der Aufgaben je times_done Level
+        if self.exam_id:
+            sql, params = SQL_LEVEL_HISTOGRAM_EXAM, (min_points, max_points, self.exam_id)
+        else:
+            sql, params = SQL_LEVEL_HISTOGRAM, (min_points, max_points)
         
-        # Get minimum completion level (current round)
-        min_completion_level = self._get_min_completion_level(cursor, min_points, max_points)
+        with self.db_manager.connection() as conn:
+            histogram = dict(conn.execute(sql, params).fetchall())
         
-        if min_completion_level is None:
-            conn.close()
+        if not histogram:
             return {
                 'total': 0,
                 'completed': 0,
@@ -221,382 +548,267 @@ class TaskRepository:
                 'tasks_at_current_level': 0
             }
         
-        # Build queries with optional exam filtering
-        total_query = '''
-            SELECT COUNT(*) 
-            FROM tasks t
-            JOIN worksheets w ON t.worksheet_id = w.id
-            WHERE t.total_points >= ? AND t.total_points <= ?
-        '''
-        
-        completed_query = '''
-            SELECT COUNT(*) 
-            FROM tasks t
-            JOIN worksheets w ON t.worksheet_id = w.id
-            WHERE t.total_points >= ? AND t.total_points <= ? AND t.times_done > 0
-        '''
-        
-        current_level_query = '''
-            SELECT COUNT(*) 
-            FROM tasks t
-            JOIN worksheets w ON t.worksheet_id = w.id
-            WHERE t.total_points >= ? AND t.total_points <= ? AND t.times_done = ?
-        '''
-        
-        params = [min_points, max_points]
-        if self.exam_id:
-            total_query += ' AND w.exam_id = ?'
-            completed_query += ' AND w.exam_id = ?'
-            current_level_query += ' AND w.exam_id = ?'
-            params.append(self.exam_id)
-        
-        # Gesamtanzahl der Aufgaben im Punktebereich
-        cursor.execute(total_query, params)
-        total_tasks = cursor.fetchone()[0]
-        
-        # Anzahl der erledigten Aufgaben (times_done > 0)
-        cursor.execute(completed_query, params)
-        completed_tasks = cursor.fetchone()[0]
-        
-        # Anzahl der Aufgaben auf dem aktuellen Level
-        current_level_params = [min_points, max_points, min_completion_level]
-        if self.exam_id:
-            current_level_params.append(self.exam_id)
-        
-        cursor.execute(current_level_query, current_level_params)
-        tasks_at_current_level = cursor.fetchone()[0]
-        
-        conn.close()
+        # Minimum completion level (current round) und Summen aus dem Histogramm
+        min_completion_level = min(histogram)
+        total_tasks = sum(histogram.values())
+        completed_tasks = total_tasks - histogram.get(0, 0)
         
         return {
             'total': total_tasks,
             'completed': completed_tasks,
             'remaining': total_tasks - completed_tasks,
             'current_round': min_completion_level + 1,  # Round is 1-based (0 times done = Round 1)
-            'tasks_at_current_level': tasks_at_current_level
+            'tasks_at_current_level': histogram[min_completion_level]
         }
     
     def get_task_with_longest_time_per_point(self, min_points: int, max_points: int) -> Optional[Dict]:
         """Wählt die Aufgabe mit der längsten Zeit pro Punkt vom letzten Versuch"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        # Query to find the task with the highest time per point from the last attempt
-        query = '''
-            WITH last_attempts AS (
+        with self.db_manager.connection() as conn:
+            # Query to find the task with the highest time per point from the last attempt
+            query = '''
+                WITH last_attempts AS (
+                    SELECT 
+                        t.id as task_id,
+                        w.semester,
+                        w.sheet_number,
+                        t.task_number,
+                        t.total_points,
+                        t.times_done,
+                        sa.total_time_seconds,
+                        sa.attempt_date,
+                        ROW_NUMBER() OVER (PARTITION BY t.id ORDER BY sa.attempt_date DESC, sa.id DESC) as rn
+                    FROM tasks t
+                    JOIN worksheets w ON t.worksheet_id = w.id
+                    JOIN solution_attempts sa ON t.id = sa.task_id
+                    WHERE t.total_points >= ? AND t.total_points <= ?
+                        AND sa.status = 'completed'
+                        AND sa.total_time_seconds IS NOT NULL
+                        AND t.total_points > 0
+            '''
+            
+            params = [min_points, max_points]
+            if self.exam_id:
+                query += ' AND w.exam_id = ?'
+                params.append(self.exam_id)
+            
+            query += '''
+                )
                 SELECT 
-                    t.id as task_id,
-                    w.semester,
-                    w.sheet_number,
-                    t.task_number,
-                    t.total_points,
-                    t.times_done,
-                    sa.total_time_seconds,
-                    sa.attempt_date,
-                    ROW_NUMBER() OVER (PARTITION BY t.id ORDER BY sa.attempt_date DESC, sa.id DESC) as rn
-                FROM tasks t
-                JOIN worksheets w ON t.worksheet_id = w.id
-                JOIN solution_attempts sa ON t.id = sa.task_id
-                WHERE t.total_points >= ? AND t.total_points <= ?
-                    AND sa.status = 'completed'
-                    AND sa.total_time_seconds IS NOT NULL
-                    AND t.total_points > 0
-        '''
-        
-        params = [min_points, max_points]
-        if self.exam_id:
-            query += ' AND w.exam_id = ?'
-            params.append(self.exam_id)
-        
-        query += '''
-            )
-            SELECT 
-                task_id,
-                semester,
-                sheet_number,
-                task_number,
-                total_points,
-                times_done,
-                total_time_seconds,
-                (CAST(total_time_seconds AS FLOAT) / total_points) as time_per_point
-            FROM last_attempts
-            WHERE rn = 1
-            ORDER BY time_per_point DESC
-            LIMIT 1
-        '''
-        
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
-            return None
-        
-        return {
-            'id': result[0],
-            'semester': result[1],
-            'sheet_number': result[2],
-            'task_number': result[3],
-            'total_points': result[4],
-            'times_done': result[5],
-            'is_repeat': result[5] > 0,
-            'last_time_seconds': result[6],
-            'time_per_point': result[7]
-        }
+                    task_id AS id,
+                    semester,
+                    sheet_number,
+                    task_number,
+                    total_points,
+                    times_done,
+                    total_time_seconds AS last_time_seconds,
+                    (CAST(total_time_seconds AS FLOAT) / total_points) as time_per_point
+                FROM last_attempts
+                WHERE rn = 1
+                ORDER BY time_per_point DESC
+                LIMIT 1
+            '''
+            
+            result = conn.execute(query, params).fetchone()
+            
+            if not result:
+                return None
+            
+            return dict(result, is_repeat=result['times_done'] > 0)
 
 
 class ExamRepository:
+    # Bumped by create_exam; invalidates the exam lookup caches of all instances
+    _version = 0
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self._exam_cached = lru_cache(maxsize=128)(self._exam_uncached)
     
     def list_exams(self) -> List[Dict]:
         """Lists all available exams"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 
-                e.id,
-                e.name,
-                e.description,
-                e.created_at,
-                COUNT(w.id) as worksheet_count,
-                COUNT(DISTINCT t.id) as task_count
-            FROM exams e
-            LEFT JOIN worksheets w ON e.id = w.exam_id
-            LEFT JOIN tasks t ON w.id = t.worksheet_id
-            GROUP BY e.id, e.name, e.description, e.created_at
-            ORDER BY e.created_at
-        ''')
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        exams = []
-        for row in results:
-            exams.append({
-                'id': row[0],
-                'name': row[1],
-                'description': row[2],
-                'created_at': row[3],
-                'worksheet_count': row[4],
-                'task_count': row[5]
-            })
+        with self.db_manager.connection() as conn:
+            cursor = conn.execute('''
+                SELECT 
+                    e.id,
+                    e.name,
+                    e.description,
+                    e.created_at,
+                    (SELECT COUNT(*) FROM worksheets w
+                     WHERE w.exam_id = e.id) as worksheet_count,
+                    (SELECT COUNT(*) FROM worksheets w
+                     JOIN tasks t ON t.worksheet_id = w.id
+                     WHERE w.exam_id = e.id) as task_count
+                FROM exams e
+                ORDER BY e.created_at
+            ''')
+            
+            results = cursor.fetchall()
         
-        return exams
+        return [dict(row) for row in results]
+    
+    def get_exam_by_id(self, exam_id: int) -> Optional[Dict]:
+        """Gets exam by ID"""
+        return self._get_exam(SQL_EXAM_BY_ID, exam_id)
     
     def get_exam_by_name(self, name: str) -> Optional[Dict]:
         """Gets exam by name"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, name, description, created_at
-            FROM exams
-            WHERE name = ?
-        ''', (name,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return {
-                'id': result[0],
-                'name': result[1],
-                'description': result[2],
-                'created_at': result[3]
-            }
-        return None
+        return self._get_exam(SQL_EXAM_BY_NAME, name)
+    
+    def _get_exam(self, sql: str, param: Any) -> Optional[Dict]:
+        """Shared lookup; exams rarely change, so rows are cached until create_exam"""
+        try:
+            result = self._exam_cached(ExamRepository._version, sql, param)
+        except LookupError:
+            # Misses are not cached (lru_cache skips raising calls): another
+            # process may create the exam later
+            return None
+        return dict(result)
+    
+    def _exam_uncached(self, version: int, sql: str, param: Any) -> sqlite3.Row:
+        """Reads one exam row; version is only part of the cache key"""
+        with self.db_manager.connection() as conn:
+            row = conn.execute(sql, (param,)).fetchone()
+        if row is None:
+            raise LookupError(param)
+        return row
     
     def create_exam(self, name: str, description: Optional[str] = None) -> int:
         """Creates a new exam (used internally by import system)"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
+        with self.db_manager.connection() as conn:
+            cursor = conn.execute('''
                 INSERT INTO exams (name, description)
                 VALUES (?, ?)
-            ''', (name, description))
+            ''' + RETURNING_ID, (name, description))
             
-            exam_id = cursor.lastrowid
+            exam_id = _inserted_id(cursor)
             if exam_id is None:
                 raise RuntimeError("Failed to create exam - no ID returned")
             
-            conn.commit()
-            return exam_id
-            
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        ExamRepository._version += 1
+        return exam_id
 
 
 class AttemptRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
     
+    def batch(self):
+        """Führt alle Schreibzugriffe im with-Block in einer gemeinsamen Transaktion aus"""
+        return self.db_manager.transaction()
+    
     def create_attempt(self, task_id: int, status: str = 'in_progress') -> int:
         """Erstellt einen neuen Lösungsversuch"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO solution_attempts (task_id, attempt_date, status)
-            VALUES (?, ?, ?)
-        ''', (task_id, date.today(), status))
-        
-        attempt_id = cursor.lastrowid
-        if attempt_id is None:
-            conn.close()
-            raise RuntimeError("Failed to create solution attempt - no ID returned")
-        
-        conn.commit()
-        conn.close()
-        
-        return attempt_id
+        with self.db_manager.connection() as conn:
+            cursor = conn.execute(SQL_CREATE_ATTEMPT, (task_id, date.today(), status))
+            
+            attempt_id = _inserted_id(cursor)
+            if attempt_id is None:
+                raise RuntimeError("Failed to create solution attempt - no ID returned")
+            
+            return attempt_id
+    
+    def create_attempts(self, task_ids: List[int], status: str = 'in_progress') -> List[int]:
+        """Erstellt mehrere Lösungsversuche in einer Transaktion"""
+        today = date.today()
+        attempt_ids = []
+        
+        # executemany liefert keine RETURNING-Zeilen, daher einzeln innerhalb
+        # einer Transaktion (ein Commit für alle)
+        with self.db_manager.transaction() as conn:
+            for task_id in task_ids:
+                cursor = conn.execute(SQL_CREATE_ATTEMPT, (task_id, today, status))
+                attempt_id = _inserted_id(cursor)
+                if attempt_id is None:
+                    raise RuntimeError("Failed to create solution attempt - no ID returned")
+                attempt_ids.append(attempt_id)
+        
+        return attempt_ids
     
     def update_attempt_status(self, attempt_id: int, status: str, total_time: Optional[int] = None):
         """Aktualisiert Status und optional Zeit eines Versuchs"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        if total_time is not None:
-            cursor.execute('''
-                UPDATE solution_attempts 
-                SET status = ?, total_time_seconds = ?, last_updated = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, total_time, attempt_id))
-        else:
-            cursor.execute('''
+        with self.db_manager.connection() as conn:
+            if total_time is not None:
+                conn.execute('''
+                    UPDATE solution_attempts 
+                    SET status = ?, total_time_seconds = ?, last_updated = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (status, total_time, attempt_id))
+            else:
+                conn.execute('''
+                    UPDATE solution_attempts 
+                    SET status = ?, last_updated = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (status, attempt_id))
+    
+    def update_attempts_status(self, rows: List[Tuple[int, str, Optional[int]]]):
+        """Aktualisiert mehrere Versuche (attempt_id, status, total_time) in einer Transaktion"""
+        with self.db_manager.transaction() as conn:
+            conn.executemany('''
                 UPDATE solution_attempts 
-                SET status = ?, last_updated = CURRENT_TIMESTAMP
+                SET status = ?, total_time_seconds = COALESCE(?, total_time_seconds), last_updated = CURRENT_TIMESTAMP
                 WHERE id = ?
-            ''', (status, attempt_id))
-        
-        conn.commit()
-        conn.close()
+            ''', [(status, total_time, attempt_id) for attempt_id, status, total_time in rows])
     
     def auto_save_progress(self, attempt_id: int, current_time: int):
         """Speichert aktuellen Fortschritt (Auto-Save)"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE solution_attempts 
-            SET total_time_seconds = ?, last_updated = CURRENT_TIMESTAMP
-            WHERE id = ? AND status = 'in_progress'
-        ''', (current_time, attempt_id))
-        
-        conn.commit()
-        conn.close()
+        # Jeder Aufruf wird sofort committet: nur so übersteht der Stand einen
+        # abgebrochenen Prozess (Aufruf nur alle 30 s, siehe time_task_interactive)
+        with self.db_manager.connection() as conn:
+            conn.execute(SQL_AUTO_SAVE, (current_time, attempt_id))
     
     def get_incomplete_attempts(self) -> List[Dict]:
         """Holt unvollständige Versuche für Recovery"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 
-                sa.id,
-                sa.task_id,
-                sa.total_time_seconds,
-                sa.attempt_date,
-                sa.last_updated,
-                PRINTF('Sem%d Bl%d Aufg%s', w.semester, w.sheet_number, t.task_number) as task_info,
-                t.total_points
-            FROM solution_attempts sa
-            JOIN tasks t ON sa.task_id = t.id
-            JOIN worksheets w ON t.worksheet_id = w.id
-            WHERE sa.status = 'in_progress'
-            ORDER BY sa.last_updated DESC
-        ''')
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        attempts = []
-        for row in results:
-            attempts.append({
-                'attempt_id': row[0],
-                'task_id': row[1],
-                'elapsed_time': row[2] or 0,
-                'attempt_date': row[3],
-                'last_updated': row[4],
-                'task_info': row[5],
-                'total_points': row[6]
-            })
-        
-        return attempts
+        with self.db_manager.connection() as conn:
+            cursor = conn.execute(SQL_INCOMPLETE_ATTEMPTS)
+            results = cursor.fetchall()
+        
+        return [
+            dict(row, task_info=_task_label(row['semester'], row['sheet_number'], row['task_number']))
+            for row in results
+        ]
     
     def get_task_by_attempt(self, attempt_id: int) -> Optional[Dict]:
         """Holt Task-Informationen für einen Versuch"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 
-                t.id,
-                w.semester,
-                w.sheet_number,
-                t.task_number,
-                t.total_points,
-                t.times_done
-            FROM solution_attempts sa
-            JOIN tasks t ON sa.task_id = t.id
-            JOIN worksheets w ON t.worksheet_id = w.id
-            WHERE sa.id = ?
-        ''', (attempt_id,))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self.db_manager.connection() as conn:
+            cursor = conn.execute(SQL_TASK_BY_ATTEMPT, (attempt_id,))
+            result = cursor.fetchone()
         
         if not result:
             return None
-        
-        return {
-            'id': result[0],
-            'semester': result[1],
-            'sheet_number': result[2],
-            'task_number': result[3],
-            'total_points': result[4],
-            'times_done': result[5],
-            'is_repeat': result[5] > 0
-        }
+        return dict(result, is_repeat=result['times_done'] > 0)
 
     def get_statistics(self, task_id: Optional[int] = None) -> List[Tuple]:
         """Holt Zeitstatistiken"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        if task_id:
-            cursor.execute('''
-                SELECT 
-                    sa.attempt_date,
-                    sa.total_time_seconds
-                FROM solution_attempts sa
-                WHERE sa.task_id = ?
-                ORDER BY sa.attempt_date DESC
-            ''', (task_id,))
-        else:
-            cursor.execute('''
+        with self.db_manager.connection() as conn:
+            if task_id:
+                cursor = conn.execute('''
+                    SELECT 
+                        sa.attempt_date,
+                        sa.total_time_seconds
+                    FROM solution_attempts sa
+                    WHERE sa.task_id = ?
+                    ORDER BY sa.attempt_date DESC
+                ''', (task_id,))
+                return [tuple(row) for row in cursor.fetchall()]
+            
+            cursor = conn.execute('''
                 SELECT 
-                    PRINTF('Sem%d Bl%d Aufg%s', w.semester, w.sheet_number, t.task_number) as task_info,
+                    w.semester,
+                    w.sheet_number,
+                    t.task_number,
                     COUNT(sa.id) as attempts,
                     AVG(sa.total_time_seconds) as avg_time,
                     MIN(sa.total_time_seconds) as best_time,
                     MAX(sa.total_time_seconds) as worst_time
                 FROM tasks t
                 JOIN worksheets w ON t.worksheet_id = w.id
-                LEFT JOIN solution_attempts sa ON t.id = sa.task_id
+                JOIN solution_attempts sa ON t.id = sa.task_id
                 WHERE sa.total_time_seconds IS NOT NULL
                 GROUP BY t.id
                 ORDER BY attempts DESC
                 LIMIT 10
             ''')
+            results = cursor.fetchall()
         
-        results = cursor.fetchall()
-        conn.close()
-        
-        return results
+        # Bezeichnung (task_info) clientseitig statt per PRINTF in SQL
+        return [(_task_label(row[0], row[1], row[2]),) + tuple(row[3:]) for row in results]
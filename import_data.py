@@ -1,28 +1,99 @@
 import pandas as pd
-import re
+import sqlite3
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from database.models import DatabaseManager, ExamRepository
 
-def import_csv_to_db(csv_path: str, db_manager: DatabaseManager, clear_existing_exam: bool = False):
+# Rows per pd.read_csv chunk; keeps memory bounded for large exam files
+CSV_CHUNK_SIZE = 5000
+
+# The only CSV columns the import reads
+CSV_COLUMNS = ('Prüfung', 'Semester', 'Blatt', 'Aufgabe', 'Punkte')
+
+# SQL des Imports als Konstanten (Statement-Cache der Verbindung). Die
+# aggregierten CSV-Zeilen landen in einer Temp-Tabelle; Worksheets und Tasks
+# werden dann mit wenigen mengenbasierten Statements abgeglichen
+CREATE_STAGING_SQL = '''
+    CREATE TEMP TABLE import_staging (
+        semester INTEGER NOT NULL,
+        sheet_number INTEGER NOT NULL,
+        task_number TEXT NOT NULL,
+        total_points INTEGER NOT NULL,
+        worksheet_id INTEGER
+    )
+'''
+
+INSERT_STAGING_SQL = '''
+    INSERT INTO import_staging (semester, sheet_number, task_number, total_points)
+    VALUES (?, ?, ?, ?)
+'''
+
+# Worksheets in order of first appearance in the CSV (keeps ID order as before)
+INSERT_WORKSHEETS_FROM_STAGING_SQL = '''
+    INSERT OR IGNORE INTO worksheets (semester, sheet_number, exam_id)
+    SELECT semester, sheet_number, ?
+    FROM import_staging
+    GROUP BY semester, sheet_number
+    ORDER BY MIN(rowid)
+'''
+
+RESOLVE_STAGING_WORKSHEETS_SQL = '''
+    UPDATE import_staging SET worksheet_id = (
+        SELECT w.id FROM worksheets w
+        WHERE w.exam_id = ?
+          AND w.semester = import_staging.semester
+          AND w.sheet_number = import_staging.sheet_number
+    )
+'''
+
+INDEX_STAGING_SQL = '''
+    CREATE INDEX temp.idx_import_staging_task ON import_staging (worksheet_id, task_number)
+'''
+
+# Existing tasks keep their IDs; only changed points are written
+UPDATE_CHANGED_TASKS_SQL = '''
+    UPDATE tasks SET total_points = (
+        SELECT s.total_points FROM import_staging s
+        WHERE s.worksheet_id = tasks.worksheet_id AND s.task_number = tasks.task_number
+    )
+    WHERE worksheet_id IN (SELECT worksheet_id FROM import_staging)
+      AND EXISTS (
+        SELECT 1 FROM import_staging s
+        WHERE s.worksheet_id = tasks.worksheet_id
+          AND s.task_number = tasks.task_number
+          AND s.total_points IS NOT tasks.total_points
+    )
+'''
+
+# UNIQUE(worksheet_id, task_number) skips tasks that already exist
+INSERT_NEW_TASKS_SQL = '''
+    INSERT OR IGNORE INTO tasks (worksheet_id, task_number, total_points)
+    SELECT worksheet_id, task_number, total_points
+    FROM import_staging
+    ORDER BY rowid
+'''
+
+DROP_STAGING_SQL = 'DROP TABLE temp.import_staging'
+
+def import_csv_to_db(csv_path: str, db_manager: DatabaseManager, clear_existing_exam: bool = False,
+                     exam_ids: Optional[Dict[str, int]] = None):
     """Importiert CSV-Daten in die Datenbank - streamlined version"""
     
-    # CSV einlesen
+    # CSV einlesen (ein Durchlauf liefert Prüfungsnamen und Punkte je Aufgabe)
     print(f"📖 Reading CSV file: {csv_path}")
     try:
-        df = pd.read_csv(csv_path, sep=';')
-        print(f"   Found: {len(df)} rows")
+        exam_names, task_totals, invalid_rows, total_rows = _read_task_points(csv_path)
+        print(f"   Found: {total_rows} rows")
     except Exception as e:
         print(f"❌ Failed to read CSV file: {e}")
         raise
     
-    # Auto-extract exam name from CSV
-    if 'Prüfung' not in df.columns:
-        print("❌ CSV must contain 'Prüfung' column")
-        raise ValueError("Missing 'Prüfung' column in CSV")
+    for row_num in invalid_rows:
+        print(f"❌ Error at row {row_num}: invalid Semester/Blatt/Aufgabe/Punkte value")
+    print(f"   📄 Processed: {total_rows - len(invalid_rows)}/{total_rows} rows")
     
-    exam_names = df['Prüfung'].unique()
+    # Auto-extract exam name from CSV
     if len(exam_names) > 1:
         print(f"⚠️  Multiple exam names found in CSV: {exam_names}")
         print("   Using the first one...")
@@ -30,233 +101,158 @@ def import_csv_to_db(csv_path: str, db_manager: DatabaseManager, clear_existing_
     exam_name = exam_names[0]
     print(f"📋 Auto-detected exam name: {exam_name}")
     
-    # Show some examples of task extraction
-    print("\n🔍 Task extraction examples:")
-    sample_tasks = df['Aufgabe'].unique()[:10]  # First 10 unique tasks
-    for task in sample_tasks:
-        print(f"   '{task}' -> '{task}'")
-    
-    # Use ExamRepository to handle exam creation/lookup
-    exam_repo = ExamRepository(db_manager)
-    
-    # Check if exam exists, create if not
-    exam = exam_repo.get_exam_by_name(exam_name)
-    if not exam:
-        print(f"📋 Creating new exam: {exam_name}")
-        exam_id = exam_repo.create_exam(exam_name, f"Imported from {csv_path}")
-    else:
-        exam_id = exam['id']
-        print(f"📋 Using existing exam: {exam_name} (ID: {exam_id})")
-    
-    if clear_existing_exam:
-        print("🗑️  Clearing existing data for this exam...")
-        _clear_exam_data(db_manager, exam_id)
+    # Bulk imports pass a name -> ID map loaded once; it is kept up to date here
+    if exam_ids is None:
+        exam = ExamRepository(db_manager).get_exam_by_name(exam_name)
+        exam_ids = {exam_name: exam['id']} if exam else {}
     
     try:
-        # Import CSV data with smart merge
-        _import_csv_data_smart_merge(csv_path, db_manager, exam_id)
+        # One transaction for exam creation, clearing and the merge: a failed
+        # import leaves neither a new empty exam nor half-cleared data behind
+        with db_manager.transaction() as conn:
+            # Check if exam exists, create if not
+            exam_id = exam_ids.get(exam_name)
+            if exam_id is None:
+                print(f"📋 Creating new exam: {exam_name}")
+                exam_id = ExamRepository(db_manager).create_exam(exam_name, f"Imported from {csv_path}")
+            else:
+                print(f"📋 Using existing exam: {exam_name} (ID: {exam_id})")
+            
+            if clear_existing_exam:
+                print("🗑️  Clearing existing data for this exam...")
+                _clear_exam_data(db_manager, exam_id)
+            
+            # Import CSV data with smart merge
+            _import_csv_data_smart_merge(task_totals, conn, exam_id)
         
     except Exception as e:
+        # transaction() has already rolled back
         print(f"❌ Import failed: {e}")
         raise
+    
+    # Only committed exams go into the shared map
+    exam_ids[exam_name] = exam_id
 
 def _clear_exam_data(db_manager: DatabaseManager, exam_id: int):
     """Clears all data for a specific exam (but keeps the exam record)"""
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
-    
     try:
-        # Delete in correct order
-        cursor.execute('''
-            DELETE FROM solution_attempts 
-            WHERE task_id IN (
-                SELECT t.id FROM tasks t
-                JOIN worksheets w ON t.worksheet_id = w.id
-                WHERE w.exam_id = ?
-            )
-        ''', (exam_id,))
-        
-        
-        cursor.execute('''
-            DELETE FROM tasks 
-            WHERE worksheet_id IN (
-                SELECT id FROM worksheets WHERE exam_id = ?
-            )
-        ''', (exam_id,))
-        
-        cursor.execute('DELETE FROM worksheets WHERE exam_id = ?', (exam_id,))
+        # One transaction for all deletes (rolled back by transaction() on error)
+        with db_manager.transaction() as conn:
+            # Delete in correct order
+            conn.execute('''
+                DELETE FROM solution_attempts 
+                WHERE task_id IN (
+                    SELECT t.id FROM task_with_sheet t WHERE t.exam_id = ?
+                )
+            ''', (exam_id,))
+            
+            conn.execute('''
+                DELETE FROM tasks 
+                WHERE worksheet_id IN (
+                    SELECT id FROM worksheets WHERE exam_id = ?
+                )
+            ''', (exam_id,))
+            
+            conn.execute('DELETE FROM worksheets WHERE exam_id = ?', (exam_id,))
         
-        conn.commit()
         print("✅ Existing exam data cleared")
         
     except Exception as e:
-        conn.rollback()
         print(f"❌ Failed to clear exam data: {e}")
         raise
-    finally:
-        conn.close()
 
-def _import_csv_data_smart_merge(csv_path: str, db_manager: DatabaseManager, exam_id: int):
-    """Imports CSV data with smart merging - preserves existing tasks and their IDs"""
-    print(f"📖 Reading CSV file: {csv_path}")
-    
-    try:
-        df = pd.read_csv(csv_path, sep=';')
-        print(f"   Found: {len(df)} rows")
-    except Exception as e:
-        print(f"❌ Failed to read CSV: {e}")
-        raise
-    
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Import worksheets (using INSERT OR IGNORE to preserve existing ones)
-        print("\n📋 Importing worksheets...")
-        worksheets = df[['Semester', 'Blatt']].drop_duplicates()
-        
-        for _, row in worksheets.iterrows():
-            try:
-                cursor.execute('''
-                    INSERT OR IGNORE INTO worksheets (semester, sheet_number, exam_id)
-                    VALUES (?, ?, ?)
-                ''', (int(row['Semester']), int(row['Blatt']), exam_id))
-                
-                # Check if it was a new worksheet or existing one
-                cursor.execute('''
-                    SELECT id FROM worksheets 
-                    WHERE semester = ? AND sheet_number = ? AND exam_id = ?
-                ''', (int(row['Semester']), int(row['Blatt']), exam_id))
-                
-                worksheet_id = cursor.fetchone()[0]
-                if cursor.rowcount > 0:  # New worksheet was inserted  
-                    print(f"   ✅ NEW: Semester {row['Semester']}, Blatt {row['Blatt']}")
-                else:
-                    print(f"   ↻ EXISTS: Semester {row['Semester']}, Blatt {row['Blatt']} (ID: {worksheet_id})")
-                    
-            except Exception as e:
-                print(f"   ⚠️  Error with worksheet: Semester {row['Semester']}, Blatt {row['Blatt']} - {e}")
-        
-        conn.commit()
-        
-        # Group by main task and sum points
-        print("\n📝 Processing tasks...")
-        
-        # Create a dictionary to accumulate points for each main task
-        task_points = {}
-        
-        for index, row in df.iterrows():
-            try:
-                task = str(row['Aufgabe'])
-                semester = int(pd.to_numeric(row['Semester']))
-                blatt = int(pd.to_numeric(row['Blatt']))
-                points = int(pd.to_numeric(row['Punkte']))
-                
-                # Create unique key for task
-                task_key = (semester, blatt, task)
-                
-                if task_key not in task_points:
-                    task_points[task_key] = 0
-                
-                task_points[task_key] += points
-                
-                row_num = int(index) if isinstance(index, (int, float)) else 0
-                if row_num % 20 == 0:
-                    print(f"   📄 Processed: {row_num + 1}/{len(df)} rows")
-            
-            except Exception as e:
-                row_num = int(index) if isinstance(index, (int, float)) else 0
-                print(f"❌ Error at row {row_num + 1}: {e}")
-                continue
-        
-        # Smart merge of tasks - preserve existing tasks and their IDs
-        print(f"\n📝 Smart merging {len(task_points)} tasks...")
-        
-        updated_count = 0
-        created_count = 0
-        unchanged_count = 0
+def _read_task_points(csv_path: str):
+    """Reads the CSV once in chunks: exam names and summed points per (semester, sheet, task)"""
+    exam_names = {}
+    partials = []
+    invalid_rows = []
+    total_rows = 0
+    
+    # Aufgabe is read as text so every chunk sees the same values; the numeric
+    # conversion below is done once over all task labels. Prüfung repeats one
+    # name per row, so it is parsed as a category (one string per distinct name)
+    reader = pd.read_csv(csv_path, sep=';', usecols=lambda column: column in CSV_COLUMNS,
+                         dtype={'Prüfung': 'category', 'Aufgabe': str}, chunksize=CSV_CHUNK_SIZE, engine='c')
+    for chunk in reader:
+        if 'Prüfung' not in chunk.columns:
+            raise ValueError("Missing 'Prüfung' column in CSV")
+        exam_names.update(dict.fromkeys(chunk['Prüfung'].unique().tolist()))
         
-        for (semester, blatt, task), total_points in task_points.items():
-            try:
-                # Get worksheet ID
-                cursor.execute('''
-                    SELECT id FROM worksheets 
-                    WHERE semester = ? AND sheet_number = ? AND exam_id = ?
-                ''', (semester, blatt, exam_id))
-                
-                worksheet_result = cursor.fetchone()
-                if worksheet_result is None:
-                    print(f"❌ Worksheet not found: Semester {semester}, Blatt {blatt}")
-                    continue
-                
-                worksheet_id = worksheet_result[0]
-                
-                # Check if task already exists
-                cursor.execute('''
-                    SELECT id, total_points FROM tasks 
-                    WHERE worksheet_id = ? AND task_number = ?
-                ''', (worksheet_id, task))
-                
-                existing_task = cursor.fetchone()
-                
-                if existing_task:
-                    # Task exists - check if points changed
-                    task_id, current_points = existing_task
-                    
-                    if current_points != total_points:
-                        # Update points only
-                        cursor.execute('''
-                            UPDATE tasks SET total_points = ? 
-                            WHERE id = ?
-                        ''', (total_points, task_id))
-                        print(f"   ↻ UPDATED: S{semester}/B{blatt}/T{task} - {current_points}→{total_points} pts (ID: {task_id})")
-                        updated_count += 1
-                    else:
-                        print(f"   ✓ UNCHANGED: S{semester}/B{blatt}/T{task} - {total_points} pts (ID: {task_id})")
-                        unchanged_count += 1
-                else:
-                    # New task - insert it
-                    cursor.execute('''
-                        INSERT INTO tasks (worksheet_id, task_number, total_points)
-                        VALUES (?, ?, ?)
-                    ''', (worksheet_id, task, total_points))
-                    
-                    new_task_id = cursor.lastrowid
-                    print(f"   ✅ NEW: S{semester}/B{blatt}/T{task} - {total_points} pts (ID: {new_task_id})")
-                    created_count += 1
-                
-            except Exception as e:
-                print(f"❌ Error processing task {task}: {e}")
-                continue
+        rows = pd.DataFrame({
+            'semester': pd.to_numeric(chunk['Semester'], errors='coerce'),
+            'blatt': pd.to_numeric(chunk['Blatt'], errors='coerce'),
+            'task': chunk['Aufgabe'],
+            'points': pd.to_numeric(chunk['Punkte'], errors='coerce'),
+        })
+        # Reported by the caller together with the other read results
+        invalid = rows.isna().any(axis=1)
+        invalid_rows.extend(int(row_num) + 1 for row_num in rows.index[invalid])
         
-        conn.commit()
-        
-        # Show statistics
-        cursor.execute('''
-            SELECT COUNT(*) FROM worksheets WHERE exam_id = ?
-        ''', (exam_id,))
-        worksheet_count = cursor.fetchone()[0]
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM tasks 
-            WHERE worksheet_id IN (SELECT id FROM worksheets WHERE exam_id = ?)
-        ''', (exam_id,))
-        task_count = cursor.fetchone()[0]
-        
-        print(f"\n✅ Smart merge completed!")
-        print(f"   📋 {worksheet_count} worksheets total")
-        print(f"   📝 {task_count} tasks total")
-        print(f"   ➕ {created_count} new tasks created")
-        print(f"   ↻ {updated_count} existing tasks updated")
-        print(f"   ✓ {unchanged_count} tasks unchanged")
-        print(f"   🔒 All existing task IDs and solution_attempts preserved!")
-        
-    except Exception as e:
-        print(f"❌ Import failed: {e}")
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+        rows = rows[~invalid].astype({'semester': int, 'blatt': int, 'points': int})
+        partials.append(rows.groupby(['semester', 'blatt', 'task'], sort=False)['points'].sum())
+        total_rows += len(chunk)
+    
+    if not partials:
+        return list(exam_names), pd.DataFrame(columns=['semester', 'blatt', 'task', 'points']), invalid_rows, total_rows
+    
+    totals = pd.concat(partials).reset_index()
+    # Same labels as a whole-file read: purely numeric task columns become
+    # numbers ('1' -> '1.0' next to '1.1'), so existing task numbers still match
+    numeric_tasks = pd.to_numeric(totals['task'], errors='coerce')
+    if len(totals) and not numeric_tasks.isna().any():
+        totals['task'] = numeric_tasks.astype(str)
+    totals = totals.groupby(['semester', 'blatt', 'task'], sort=False, as_index=False)['points'].sum()
+    return list(exam_names), totals, invalid_rows, total_rows
+
+def _import_csv_data_smart_merge(task_totals: pd.DataFrame, conn: sqlite3.Connection, exam_id: int):
+    """Imports CSV data with smart merging inside the caller's transaction - preserves existing tasks and their IDs"""
+    cursor = conn.cursor()
+    
+    cursor.execute(CREATE_STAGING_SQL)
+    # itertuples yields plain tuples of Python values (no Series per row)
+    cursor.executemany(INSERT_STAGING_SQL, task_totals.itertuples(index=False, name=None))
+    
+    # Import worksheets (using INSERT OR IGNORE to preserve existing ones)
+    print("\n📋 Importing worksheets...")
+    worksheet_total = len(task_totals[['semester', 'blatt']].drop_duplicates())
+    cursor.execute(INSERT_WORKSHEETS_FROM_STAGING_SQL, (exam_id,))
+    new_worksheets = max(cursor.rowcount, 0)
+    print(f"   ✅ NEW: {new_worksheets} worksheets")
+    print(f"   ↻ EXISTS: {worksheet_total - new_worksheets} worksheets")
+    
+    cursor.execute(RESOLVE_STAGING_WORKSHEETS_SQL, (exam_id,))
+    cursor.execute(INDEX_STAGING_SQL)
+    
+    # Smart merge of tasks - preserve existing tasks and their IDs
+    print(f"\n📝 Smart merging {len(task_totals)} tasks...")
+    
+    cursor.execute(UPDATE_CHANGED_TASKS_SQL)
+    updated_count = max(cursor.rowcount, 0)
+    cursor.execute(INSERT_NEW_TASKS_SQL)
+    new_count = max(cursor.rowcount, 0)
+    unchanged_count = len(task_totals) - updated_count - new_count
+    
+    cursor.execute(DROP_STAGING_SQL)
+    
+    # Show statistics
+    cursor.execute('''
+        SELECT COUNT(*) FROM worksheets WHERE exam_id = ?
+    ''', (exam_id,))
+    worksheet_count = cursor.fetchone()[0]
+    
+    cursor.execute('''
+        SELECT COUNT(*) FROM tasks 
+        WHERE worksheet_id IN (SELECT id FROM worksheets WHERE exam_id = ?)
+    ''', (exam_id,))
+    task_count = cursor.fetchone()[0]
+    
+    print(f"\n✅ Smart merge completed!")
+    print(f"   📋 {worksheet_count} worksheets total")
+    print(f"   📝 {task_count} tasks total")
+    print(f"   ➕ {new_count} new tasks created")
+    print(f"   ↻ {updated_count} existing tasks updated")
+    print(f"   ✓ {unchanged_count} tasks unchanged")
+    print(f"   🔒 All existing task IDs and solution_attempts preserved!")
 
 def show_database_content(db_manager: DatabaseManager, limit: int = 20):
     """Zeigt den Inhalt der Datenbank"""
@@ -295,8 +291,6 @@ def show_database_content(db_manager: DatabaseManager, limit: int = 20):
         
     except Exception as e:
         print(f"❌ Fehler beim Anzeigen der Datenbank: {e}")
-    finally:
-        conn.close()
 
 def import_all_exams_from_directory(exams_dir: str, db_manager: DatabaseManager, clear_existing_exams: bool = False):
     """Imports all CSV files from the exams directory"""
@@ -324,13 +318,16 @@ def import_all_exams_from_directory(exams_dir: str, db_manager: DatabaseManager,
     successful_imports = 0
     failed_imports = 0
     
+    # One lookup for all files instead of one get_exam_by_name per file
+    exam_ids = {exam['name']: exam['id'] for exam in ExamRepository(db_manager).list_exams()}
+    
     for csv_file in csv_files:
         print(f"\n{'='*40}")
         print(f"📥 Processing: {csv_file.name}")
         print(f"{'='*40}")
         
         try:
-            import_csv_to_db(str(csv_file), db_manager, clear_existing_exams)
+            import_csv_to_db(str(csv_file), db_manager, clear_existing_exams, exam_ids)
             successful_imports += 1
             print(f"✅ Successfully imported: {csv_file.name}")
             
@@ -358,65 +355,68 @@ def main():
     db_manager = DatabaseManager()
     db_manager.init_database()
     
-    # Check if we should import all exams from directory (default behavior)
-    if len(sys.argv) == 1:
-        # No arguments - import all from ./exams directory
-        print("📁 No specific file provided - importing all exams from ./exams directory")
-        import_all_exams_from_directory("./exams", db_manager, clear_existing_exams=False)
-        return
-    
-    # Check for --all flag
-    if "--all" in sys.argv:
-        clear_existing_exams = "--clear-exams" in sys.argv
-        print("📁 Importing all exams from ./exams directory")
-        if clear_existing_exams:
-            print("⚠️  Will clear existing exam data before import")
-        import_all_exams_from_directory("./exams", db_manager, clear_existing_exams)
-        return
-    
-    # Single file import (legacy behavior)
-    if len(sys.argv) < 2:
-        print("❌ Usage:")
-        print("   python import_data.py                    # Import all CSV files from ./exams (smart merge)")
-        print("   python import_data.py --all              # Import all CSV files from ./exams (smart merge)")
-        print("   python import_data.py --all --clear-exams # Import all, clearing existing data")
-        print("   python import_data.py <csv_file>         # Import specific CSV file (smart merge)")
-        print("   python import_data.py <csv_file> --clear-exam # Import specific file, clear existing")
-        sys.exit(1)
-    
-    csv_file = sys.argv[1]
-    clear_existing_exam = "--clear-exam" in sys.argv
-    
-    # Check if CSV file exists
-    if not Path(csv_file).exists():
-        print(f"❌ CSV file not found: {csv_file}")
-        sys.exit(1)
-    
-    print("=" * 60)
-    print("📥 SINGLE FILE CSV IMPORT")
-    print("=" * 60)
-    
-    # Import single CSV
     try:
-        print(f"\n📥 Starting import from: {csv_file}")
-        if clear_existing_exam:
-            print("⚠️  Will clear existing exam data before import")
-        else:
-            print("🔄 Using smart merge - existing tasks and progress preserved")
+        # Check if we should import all exams from directory (default behavior)
+        if len(sys.argv) == 1:
+            # No arguments - import all from ./exams directory
+            print("📁 No specific file provided - importing all exams from ./exams directory")
+            import_all_exams_from_directory("./exams", db_manager, clear_existing_exams=False)
+            return
         
-        import_csv_to_db(csv_file, db_manager, clear_existing_exam)
+        # Check for --all flag
+        if "--all" in sys.argv:
+            clear_existing_exams = "--clear-exams" in sys.argv
+            print("📁 Importing all exams from ./exams directory")
+            if clear_existing_exams:
+                print("⚠️  Will clear existing exam data before import")
+            import_all_exams_from_directory("./exams", db_manager, clear_existing_exams)
+            return
         
-        print("\n" + "="*60)
-        print("✅ IMPORT SUCCESSFUL!")
-        print("="*60)
+        # Single file import (legacy behavior)
+        if len(sys.argv) < 2:
+            print("❌ Usage:")
+            print("   python import_data.py                    # Import all CSV files from ./exams (smart merge)")
+            print("   python import_data.py --all              # Import all CSV files from ./exams (smart merge)")
+            print("   python import_data.py --all --clear-exams # Import all, clearing existing data")
+            print("   python import_data.py <csv_file>         # Import specific CSV file (smart merge)")
+            print("   python import_data.py <csv_file> --clear-exam # Import specific file, clear existing")
+            sys.exit(1)
         
-        # Show brief overview
-        print("\n📊 Quick overview:")
-        show_database_content(db_manager, limit=10)
+        csv_file = sys.argv[1]
+        clear_existing_exam = "--clear-exam" in sys.argv
         
-    except Exception as e:
-        print(f"\n❌ Import failed: {e}")
-        sys.exit(1)
+        # Check if CSV file exists
+        if not Path(csv_file).exists():
+            print(f"❌ CSV file not found: {csv_file}")
+            sys.exit(1)
+        
+        print("=" * 60)
+        print("📥 SINGLE FILE CSV IMPORT")
+        print("=" * 60)
+        
+        # Import single CSV
+        try:
+            print(f"\n📥 Starting import from: {csv_file}")
+            if clear_existing_exam:
+                print("⚠️  Will clear existing exam data before import")
+            else:
+                print("🔄 Using smart merge - existing tasks and progress preserved")
+            
+            import_csv_to_db(csv_file, db_manager, clear_existing_exam)
+            
+            print("\n" + "="*60)
+            print("✅ IMPORT SUCCESSFUL!")
+            print("="*60)
+            
+            # Show brief overview
+            print("\n📊 Quick overview:")
+            show_database_content(db_manager, limit=10)
+            
+        except Exception as e:
+            print(f"\n❌ Import failed: {e}")
+            sys.exit(1)
+    finally:
+        db_manager.close()
 
 if __name__ == "__main__":
     main()
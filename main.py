@@ -41,74 +41,77 @@ def main():
     db_manager = DatabaseManager()
     db_manager.init_database()
     
-    # Create task service for exam selection
-    temp_task_service = TaskService(db_manager)
-    
-    # Select exam
-    exam_id = select_exam(temp_task_service)
-    
-    task_service = TaskService(db_manager, exam_id)
-    ui = ConsoleUI(task_service)
-    
-    # Show current exam info
-    exam_info = task_service.get_current_exam_info()
-    
-    print("=== Lernassistent ===")
-    if exam_info:
-        print(f"📋 Current Exam: {exam_info['name']}")
-    
-    # Prüfe auf unterbrochene Sessions
-    recovery_handled = ui.show_recovery_options()
-    
-    while True:
-        print("\n" + "="*50)
-        if exam_info:
-            print(f"Current Exam: {exam_info['name']}")
-        print("1. Aufgabe lösen (zufällig)")
-        print("2. Aufgabe mit längster Zeit/Punkt lösen")
-        print("3. Switch exam")
-        print("4. Beenden")
+    try:
+        # Create task service for exam selection
+        temp_task_service = TaskService(db_manager)
         
-        choice = get_simple_input("\nWahl: ")
+        # Select exam
+        exam_id = select_exam(temp_task_service)
         
-        if choice == '1':
-            point_range = ui.get_point_range()
-            if point_range is not None:
-                min_points, max_points = point_range
-                task = task_service.get_random_task(min_points, max_points)
-                if task is not None:
-                    # Hole Aufgaben-Statistiken für den gewählten Punktebereich
-                    task_counts = task_service.get_task_counts_by_point_range(min_points, max_points)
-                    ui.solve_task_interactive(task, task_counts, (min_points, max_points))
-                else:
-                    print("❌ Keine Aufgabe im gewählten Punktebereich gefunden!")
+        task_service = TaskService(db_manager, exam_id)
+        ui = ConsoleUI(task_service)
         
-        elif choice == '2':
-            point_range = ui.get_point_range()
-            if point_range is not None:
-                min_points, max_points = point_range
-                task = task_service.get_task_with_longest_time_per_point(min_points, max_points)
-                if task is not None:
-                    print(f"\n🎯 Aufgabe mit längster Zeit pro Punkt ausgewählt!")
-                    # Hole Aufgaben-Statistiken für den gewählten Punktebereich
-                    task_counts = task_service.get_task_counts_by_point_range(min_points, max_points)
-                    ui.solve_task_interactive(task, task_counts, (min_points, max_points))
-                else:
-                    print("❌ Keine Aufgabe mit vorherigen Versuchen im gewählten Punktebereich gefunden!")
+        # Show current exam info
+        exam_info = task_service.get_current_exam_info()
         
-        elif choice == '3':
-            # Switch exam
-            new_exam_id = select_exam(task_service)
-            task_service.set_exam_id(new_exam_id)
-            exam_info = task_service.get_current_exam_info()
-            print(f"✅ Switched to exam: {exam_info['name'] if exam_info else 'Unknown'}")
+        print("=== Lernassistent ===")
+        if exam_info:
+            print(f"📋 Current Exam: {exam_info['name']}")
         
-        elif choice == '4':
-            print("👋 Auf Wiedersehen!")
-            break
+        # Prüfe auf unterbrochene Sessions
+        recovery_handled = ui.show_recovery_options()
         
-        else:
-            print("❌ Ungültige Auswahl!")
+        while True:
+            print("\n" + "="*50)
+            if exam_info:
+                print(f"Current Exam: {exam_info['name']}")
+            print("1. Aufgabe lösen (zufällig)")
+            print("2. Aufgabe mit längster Zeit/Punkt lösen")
+            print("3. Switch exam")
+            print("4. Beenden")
+            
+            choice = get_simple_input("\nWahl: ")
+            
+            if choice == '1':
+                point_range = ui.get_point_range()
+                if point_range is not None:
+                    min_points, max_points = point_range
+                    task = task_service.get_random_task(min_points, max_points)
+                    if task is not None:
+                        # Hole Aufgaben-Statistiken für den gewählten Punktebereich
+                        task_counts = task_service.get_task_counts_by_point_range(min_points, max_points)
+                        ui.solve_task_interactive(task, task_counts, (min_points, max_points))
+                    else:
+                        print("❌ Keine Aufgabe im gewählten Punktebereich gefunden!")
+            
+            elif choice == '2':
+                point_range = ui.get_point_range()
+                if point_range is not None:
+                    min_points, max_points = point_range
+                    task = task_service.get_task_with_longest_time_per_point(min_points, max_points)
+                    if task is not None:
+                        print(f"\n🎯 Aufgabe mit längster Zeit pro Punkt ausgewählt!")
+                        # Hole Aufgaben-Statistiken für den gewählten Punktebereich
+                        task_counts = task_service.get_task_counts_by_point_range(min_points, max_points)
+                        ui.solve_task_interactive(task, task_counts, (min_points, max_points))
+                    else:
+                        print("❌ Keine Aufgabe mit vorherigen Versuchen im gewählten Punktebereich gefunden!")
+            
+            elif choice == '3':
+                # Switch exam
+                new_exam_id = select_exam(task_service)
+                task_service.set_exam_id(new_exam_id)
+                exam_info = task_service.get_current_exam_info()
+                print(f"✅ Switched to exam: {exam_info['name'] if exam_info else 'Unknown'}")
+            
+            elif choice == '4':
+                print("👋 Auf Wiedersehen!")
+                break
+            
+            else:
+                print("❌ Ungültige Auswahl!")
+    finally:
+        db_manager.close()
 
 if __name__ == "__main__":
     try:
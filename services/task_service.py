@@ -23,26 +23,7 @@ class TaskService:
         if not self.exam_id:
             return None
         
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, name, description, created_at
-            FROM exams
-            WHERE id = ?
-        ''', (self.exam_id,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return {
-                'id': result[0],
-                'name': result[1],
-                'description': result[2],
-                'created_at': result[3]
-            }
-        return None
+        return self.exam_repo.get_exam_by_id(self.exam_id)
     
     def get_random_task(self, min_points: int, max_points: int) -> Optional[Dict]:
         """Wählt zufällige Aufgabe im Punktebereich"""
@@ -148,9 +129,10 @@ class TaskService:
             print("❌ Kein aktiver Lösungsversuch!")
             return
         
-        # Aktualisiere Status und Zeit
-        self.attempt_repo.update_attempt_status(self.current_attempt_id, 'completed', total_time)
-        self.task_repo.mark_task_done(task_id)
+        # Aktualisiere Status, Zeit und Zähler in einer Transaktion
+        with self.attempt_repo.batch():
+            self.attempt_repo.update_attempt_status(self.current_attempt_id, 'completed', total_time)
+            self.task_repo.mark_task_done(task_id)
         
         print(f"\n✅ Aufgabe abgeschlossen! Gesamtzeit: {format_time(total_time)}")
         
@@ -123,11 +123,10 @@ class ConsoleUI:
         choice = get_simple_input("\nWahl: ").lower()
         
         if choice == 'a':
-            # Alle als abgebrochen markieren
-            for attempt in incomplete_attempts:
-                self.task_service.attempt_repo.update_attempt_status(
-                    attempt['attempt_id'], 'cancelled'
-                )
+            # Alle als abgebrochen markieren (eine Transaktion)
+            self.task_service.attempt_repo.update_attempts_status(
+                [(attempt['attempt_id'], 'cancelled', None) for attempt in incomplete_attempts]
+            )
             print("✅ Alle unterbrochenen Sessions gelöscht")
             return True
         